@@ -8,12 +8,27 @@ Local development setup with minimal complexity
 # =============================================================================
 
 PRODUCER_CONFIG = {
-    'compression_type': 'LZ4',  # Options: NONE, LZ4 (ZLIB and ZSTD may not be available in all versions)
+    'compression_type': 'ZSTD',  # Options: NONE, LZ4, ZLIB, ZSTD (falls back to LZ4 if unavailable)
     'batching_enabled': True,
-    'batch_max_messages': 100,
-    'batch_max_delay_ms': 100,
+    'batch_max_messages': 1000,  # Messages packed into one batch before it is sent
+    'batch_max_delay_ms': 10,  # Max time a partial batch waits before it is sent
     'send_timeout_ms': 30000,
-    'max_pending_messages': 1000
+    'max_pending_messages': 1000,
+    'generator_workers': 0  # Processes building and serializing messages in send_many(); values <= 1 build them inline
+}
+
+# =============================================================================
+# Consumer Configuration
+# =============================================================================
+
+CONSUMER_CONFIG = {
+    'subscription': 'message-viewer',
+    'consumer_type': 'Shared',        # Options: Shared, KeyShared, Exclusive, Failover (the last two ack cumulatively per batch)
+    'batch_max_messages': 100,        # Messages returned per batch_receive() call
+    'batch_max_bytes': 1024 * 1024,   # Upper bound on bytes per batch
+    'batch_timeout_ms': 100,          # Max wait before returning a partial batch
+    'receiver_queue_size': 1000,      # Messages prefetched per partition; keep in line with the producer's max_pending_messages
+    'max_total_receiver_queue_size_across_partitions': 50000  # Prefetch cap across all partitions of a partitioned topic
 }
 
 # =============================================================================
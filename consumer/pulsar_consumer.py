@@ -5,131 +5,390 @@ This script reads messages from the financial-messages topic and displays them
 """
 
 import sys
-import pulsar
+import time
+import argparse
+import functools
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final, List, Optional, Required, TypedDict
 import json
+import pulsar
 import logging
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-# Add parent directory to path to import shared config
-sys.path.append('..')
-from config import PROD_CONFIG
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Add the project root (parent of this script's directory) to the path to import
+# shared config, so imports work from any working directory
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+import config
+PROD_CONFIG = config.PROD_CONFIG
+# config.py files created before the consumer settings existed have no CONSUMER_CONFIG;
+# every setting below has a default
+CONSUMER_CONFIG = getattr(config, 'CONSUMER_CONFIG', {})
 
 # Set up logging using config
 logging.basicConfig(level=getattr(logging, PROD_CONFIG.get('log_level', 'INFO')))
 logger = logging.getLogger(__name__)
 
-def consume_messages():
-    """Consume and display messages from the financial-messages topic"""
+# Configuration resolved once at import time
+SERVICE_URL: Final = PROD_CONFIG['service_url']
+TOPIC: Final = PROD_CONFIG['topic']
+AUTH_CONFIG: Final = PROD_CONFIG['auth']
+SUBSCRIPTION: Final = CONSUMER_CONFIG.get('subscription', 'message-viewer')
+CONSUMER_TYPE: Final = getattr(pulsar.ConsumerType, CONSUMER_CONFIG.get('consumer_type', 'Shared'))
+# Shared and KeyShared subscriptions reject cumulative acknowledgements
+CUMULATIVE_ACK: Final = CONSUMER_TYPE in (pulsar.ConsumerType.Exclusive, pulsar.ConsumerType.Failover)
+RECEIVE_TIMEOUT_MS: Final = 5000
+BATCH_MAX_MESSAGES: Final = CONSUMER_CONFIG.get('batch_max_messages', 100)
+BATCH_MAX_BYTES: Final = CONSUMER_CONFIG.get('batch_max_bytes', 1024 * 1024)
+BATCH_TIMEOUT_MS: Final = CONSUMER_CONFIG.get('batch_timeout_ms', 100)
+RECEIVER_QUEUE_SIZE: Final = CONSUMER_CONFIG.get('receiver_queue_size', 1000)
+MAX_TOTAL_RECEIVER_QUEUE_SIZE: Final = CONSUMER_CONFIG.get('max_total_receiver_queue_size_across_partitions', 50000)
+
+if orjson is not None:
+    # orjson parses the raw bytes directly, no separate UTF-8 decode
+    json_loads = orjson.loads
+    def json_dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+else:
+    json_loads = json.loads
+    # One encoder reused for every message instead of json.dumps() building its own
+    json_dumps_pretty = json.JSONEncoder(indent=2, ensure_ascii=False).encode
+
+class InstrumentReferenceSummary(TypedDict, total=False):
+    """Instrument reference fields shown in the message summary"""
+    instrumentidentifier: Optional[str]
+    instrumenttype: Optional[str]
+    instrumentcurrency: Optional[str]
+
+class InstrumentSummary(TypedDict, total=False):
+    """Instrument data fields shown in the message summary"""
+    instrumentreference: Optional[InstrumentReferenceSummary]
+
+class MessageSummary(TypedDict, total=False):
+    """Financial message fields shown in the message summary"""
+    # Required so that JSON objects without them fail validation instead of decoding as {}
+    jobidentifier: Required[Optional[str]]
+    analysisidentifier: Required[Optional[str]]
+    data: Optional[List[InstrumentSummary]]
+
+# msgspec decodes only the summary fields and skips everything else in the payload.
+# Producer messages are summarized from their properties, so this only serves
+# payloads from other producers and messages published without those properties.
+summary_decoder = msgspec.json.Decoder(MessageSummary) if msgspec is not None else None
+
+# Returned by decode_summary() for JSON that is not shaped like a financial message
+NOT_A_SUMMARY = object()
+
+def decode_summary(data):
+    """
+    Decode the summary fields of a financial message
     
-    print("🔍 Pulsar Financial Message Consumer")
-    print("=" * 45)
+    Returns None if msgspec is unavailable or the payload is not JSON, and
+    NOT_A_SUMMARY if it is JSON of a different shape.
+    """
+    if summary_decoder is None:
+        return None
+    try:
+        return summary_decoder.decode(data)
+    except msgspec.ValidationError:
+        return NOT_A_SUMMARY
+    except msgspec.DecodeError:
+        # Not JSON; let the generic path handle it
+        return None
+
+# Static separator of the per-message display, built once
+SEPARATOR = "-" * 45 + "\n"
+# message_type property set by the financial message producer
+FINANCIAL_MESSAGE_TYPE = 'financial_analysis'
+
+def single_line_payload(data):
+    """
+    Fit a payload containing line breaks on one line of newline-delimited output
     
-    # Use configuration from config.py
-    service_url = PROD_CONFIG['service_url']
-    topic = PROD_CONFIG['topic']
-    auth_config = PROD_CONFIG['auth']
-    subscription = "message-viewer"
+    In JSON payloads (e.g. pretty-printed by older producers) line breaks can only be
+    whitespace between tokens, so they become spaces and the payload is otherwise
+    passed through byte for byte; anything else has its line breaks escaped.
+    """
+    try:
+        # Parsed only to tell JSON apart; re-encoding it could change numbers or keys
+        json_loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return data.replace(b'\r', b'\\r').replace(b'\n', b'\\n')
+    return data.replace(b'\r', b' ').replace(b'\n', b' ')
+
+def format_message_summary(json_data):
+    """
+    Format only the identifying fields of a financial message as display lines
     
-    print(f"📋 Configuration loaded:")
-    print(f"   Service URL: {service_url}")
-    print(f"   Topic: {topic}")
-    print(f"   Auth: {auth_config}")
+    Returns None when the payload is not shaped like a financial message.
+    """
+    items = json_data.get('data') or []
+    if not isinstance(items, list):
+        return None
+    if 'jobidentifier' not in json_data or 'analysisidentifier' not in json_data:
+        # Same rule as the Required keys of MessageSummary: some other JSON object
+        return None
+    lines = [
+        "💼 Message Summary:",
+        f"    Job ID: {json_data.get('jobidentifier')}",
+        f"    Analysis ID: {json_data.get('analysisidentifier')}"
+    ]
+    for item in items:
+        if not isinstance(item, dict):
+            return None
+        ref = item.get('instrumentreference') or {}
+        if not isinstance(ref, dict):
+            return None
+        lines.append(f"    Instrument: {ref.get('instrumentidentifier')} "
+                     f"({ref.get('instrumenttype')}, {ref.get('instrumentcurrency')})")
+    return lines
+
+def format_raw_content(data):
+    """Format a payload that is not JSON as display lines"""
+    return ["📄 Raw Message Content:", data.decode('utf-8', errors='replace')]
+
+def format_property_summary(properties, data):
+    """Format the identifying fields of a financial message from its properties as display lines"""
+    return [
+        "💼 Message Summary:",
+        f"    Job ID: {properties.get('job_id')}",
+        f"    Analysis ID: {properties.get('analysis_id')}",
+        f"    Payload: {len(data)} bytes"
+    ]
+
+def format_message(msg, message_number, verbose=False):
+    """Format the metadata and content of a single received message as one block of text"""
+    # Each accessor calls into the native client, so fetch them once
+    data = msg.data()
+    properties = msg.properties()
+    lines = [
+        f"\n📨 Message #{message_number}",
+        f"🆔 Message ID: {msg.message_id()}"
+    ]
+    if verbose:
+        lines.append(f"🔑 Partition Key: {msg.partition_key()}")
+        lines.append(f"📅 Publish Time: {msg.publish_timestamp()}")
+        
+        # Show properties
+        if properties:
+            lines.append("🏷️  Properties:")
+            for key, value in properties.items():
+                lines.append(f"    {key}: {value}")
+    
+    try:
+        lines.extend(format_content(data, properties, verbose))
+    except Exception as e:
+        # One unexpected payload must not stop the viewer (it would be redelivered
+        # and stop it again), so show it as is
+        logger.warning(f"Could not format message {msg.message_id()}: {e}")
+        lines.extend(format_raw_content(data))
+    
+    lines.append("")
+    return "\n".join(lines)
+
+def format_content(data, properties, verbose=False):
+    """Format the content of a message as display lines: a summary, or the full content when verbose"""
+    if not verbose and properties.get('message_type') == FINANCIAL_MESSAGE_TYPE:
+        # The producer copies the identifiers into the message properties,
+        # so the summary of its messages needs no JSON parsing
+        return format_property_summary(properties, data)
+    summary = None if verbose else decode_summary(data)
+    if summary is not None and summary is not NOT_A_SUMMARY:
+        summary_lines = format_message_summary(summary)
+        if summary_lines is not None:
+            return summary_lines
+    
+    # Decode and pretty-print the message content
+    try:
+        json_data = json_loads(data)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError; the stdlib
+        # parser raises UnicodeDecodeError for payloads that are not valid UTF-8
+        return format_raw_content(data)
+    # Without msgspec, check the shape of the parsed payload before summarizing it
+    if not verbose and summary is None and isinstance(json_data, dict):
+        summary_lines = format_message_summary(json_data)
+        if summary_lines is not None:
+            return summary_lines
+    return ["💼 Message Content:", json_dumps_pretty(json_data)]
+
+def consume_messages(verbose=False):
+    """
+    Consume and display messages from the financial-messages topic
+
+    When stdout is not a terminal each payload is written as sent by the producer on
+    its own line, and status output goes to stderr instead. Payloads that span several
+    lines are compacted onto one; verbose has no effect in this mode.
+
+    Args:
+        verbose: Show message metadata and the full message content instead of a summary
+    """
+    
+    raw_output = not sys.stdout.isatty()
+    if raw_output:
+        info = functools.partial(print, file=sys.stderr)
+    else:
+        # Message output is flushed once per batch instead of on every newline,
+        # so status lines flush themselves
+        sys.stdout.reconfigure(line_buffering=False)
+        info = functools.partial(print, flush=True)
+    
+    info("🔍 Pulsar Financial Message Consumer")
+    info("=" * 45)
+    
+    info(f"📋 Configuration loaded:")
+    info(f"   Service URL: {SERVICE_URL}")
+    info(f"   Topic: {TOPIC}")
+    info(f"   Auth: {AUTH_CONFIG}")
     
     client = None
     consumer = None
+    receiver = None
+    message_count = 0
     
     try:
-        print(f"🔗 Connecting to Pulsar at {service_url}")
-        print(f"📥 Reading messages from topic: {topic}")
-        print("-" * 45)
+        info(f"🔗 Connecting to Pulsar at {SERVICE_URL}")
+        info(f"📥 Reading messages from topic: {TOPIC}")
+        info("-" * 45)
         
         # Create Pulsar client with authentication if configured
         auth = None
-        if auth_config:
-            if 'oauth2' in auth_config:
-                auth = pulsar.AuthenticationOauth2(**auth_config['oauth2'])
-            elif 'token' in auth_config:
-                auth = pulsar.AuthenticationToken(auth_config['token'])
+        if AUTH_CONFIG:
+            if 'oauth2' in AUTH_CONFIG:
+                auth = pulsar.AuthenticationOauth2(**AUTH_CONFIG['oauth2'])
+            elif 'token' in AUTH_CONFIG:
+                auth = pulsar.AuthenticationToken(AUTH_CONFIG['token'])
         
         client = pulsar.Client(
-            service_url=service_url,
+            service_url=SERVICE_URL,
             authentication=auth
         )
         
+        # Receive messages in batches when the installed client supports it
+        subscribe_options = {}
+        if hasattr(pulsar, 'ConsumerBatchReceivePolicy'):
+            subscribe_options['batch_receive_policy'] = pulsar.ConsumerBatchReceivePolicy(
+                BATCH_MAX_MESSAGES,
+                BATCH_MAX_BYTES,
+                BATCH_TIMEOUT_MS
+            )
+        
         # Create consumer
         consumer = client.subscribe(
-            topic=topic,
-            subscription_name=subscription,
-            consumer_type=pulsar.ConsumerType.Shared
+            topic=TOPIC,
+            subscription_name=SUBSCRIPTION,
+            consumer_type=CONSUMER_TYPE,
+            receiver_queue_size=RECEIVER_QUEUE_SIZE,
+            max_total_receiver_queue_size_across_partitions=MAX_TOTAL_RECEIVER_QUEUE_SIZE,
+            **subscribe_options
         )
+        use_batch_receive = 'batch_receive_policy' in subscribe_options and hasattr(consumer, 'batch_receive')
+        
+        info("✅ Connected! Waiting for messages...")
+        info("📋 Press Ctrl+C to stop consuming")
+        info("-" * 45)
         
-        print("✅ Connected! Waiting for messages...")
-        print("📋 Press Ctrl+C to stop consuming")
-        print("-" * 45)
+        if use_batch_receive:
+            # Returns an empty batch once the batch timeout expires
+            receive_batch = consumer.batch_receive
+        else:
+            def receive_batch():
+                return [consumer.receive(timeout_millis=RECEIVE_TIMEOUT_MS)]
         
-        message_count = 0
+        last_message_time = time.monotonic()
+        # Raw payloads of a batch are collected here and written with one call
+        raw_buffer = bytearray()
+        # A dedicated thread keeps the next receive in flight while a batch is written out
+        receiver = ThreadPoolExecutor(max_workers=1)
+        next_batch = receiver.submit(receive_batch)
         
         while True:
             try:
-                # Receive message (with timeout)
-                msg = consumer.receive(timeout_millis=5000)  # 5 second timeout
-                
-                message_count += 1
-                print(f"\n📨 Message #{message_count}")
-                print(f"🆔 Message ID: {msg.message_id()}")
-                print(f"🔑 Partition Key: {msg.partition_key()}")
-                print(f"📅 Publish Time: {msg.publish_timestamp()}")
-                
-                # Show properties
-                if msg.properties():
-                    print("🏷️  Properties:")
-                    for key, value in msg.properties().items():
-                        print(f"    {key}: {value}")
-                
-                # Decode and pretty-print the message content
-                try:
-                    message_data = msg.data().decode('utf-8')
-                    json_data = json.loads(message_data)
-                    print("💼 Message Content:")
-                    print(json.dumps(json_data, indent=2))
-                except json.JSONDecodeError:
-                    print("📄 Raw Message Content:")
-                    print(message_data)
-                except Exception as e:
-                    print(f"⚠️  Could not decode message: {e}")
-                    print("📄 Raw bytes:")
-                    print(msg.data())
-                
-                # Acknowledge the message
-                consumer.acknowledge(msg)
-                print("✅ Message acknowledged")
-                print("-" * 45)
-                
-            except Exception as e:
-                if "Timeout" in str(e):
-                    print("⏱️  No new messages (5 second timeout)")
-                    print("📊 Use Ctrl+C to exit, or wait for new messages...")
-                    continue
-                else:
-                    print(f"❌ Error receiving message: {e}")
-                    break
+                msgs = next_batch.result()
+            except pulsar.Timeout:
+                next_batch = receiver.submit(receive_batch)
+                info(f"⏱️  No new messages ({RECEIVE_TIMEOUT_MS // 1000} second timeout)")
+                info("📊 Use Ctrl+C to exit, or wait for new messages...")
+                continue
+            
+            # Start receiving the next batch before handling this one
+            next_batch = receiver.submit(receive_batch)
+            
+            if not msgs:
+                if (time.monotonic() - last_message_time) * 1000 >= RECEIVE_TIMEOUT_MS:
+                    info(f"⏱️  No new messages ({RECEIVE_TIMEOUT_MS // 1000} second timeout)")
+                    info("📊 Use Ctrl+C to exit, or wait for new messages...")
+                    last_message_time = time.monotonic()
+                continue
+            last_message_time = time.monotonic()
+            
+            if raw_output:
+                for msg in msgs:
+                    data = msg.data()
+                    if b'\n' in data:
+                        data = single_line_payload(data)
+                    raw_buffer += data
+                    raw_buffer += b'\n'
+                sys.stdout.buffer.write(raw_buffer)
+                sys.stdout.buffer.flush()
+                raw_buffer.clear()
+            else:
+                numbers = range(message_count + 1, message_count + len(msgs) + 1)
+                texts = map(format_message, msgs, numbers, itertools.repeat(verbose))
+                sys.stdout.writelines(text + SEPARATOR for text in texts)
+                sys.stdout.flush()
+            message_count += len(msgs)
+            
+            # Acknowledge the batch once it has been written out
+            if CUMULATIVE_ACK:
+                # A batch from a partitioned topic spans several partitions and a cumulative
+                # ack only advances the partition of the message it names, so ack the last
+                # message of each partition
+                last_per_partition = {msg.topic_name(): msg for msg in msgs}
+                for msg in last_per_partition.values():
+                    consumer.acknowledge_cumulative(msg)
+            else:
+                for msg in msgs:
+                    consumer.acknowledge(msg)
+            if verbose and not raw_output:
+                info(f"✅ {len(msgs)} message(s) acknowledged")
                     
     except KeyboardInterrupt:
-        print(f"\n\n👋 Stopping consumer. Total messages consumed: {message_count}")
+        info(f"\n\n👋 Stopping consumer. Total messages consumed: {message_count}")
         
     except Exception as e:
-        print(f"\n❌ Error: {e}")
-        print("\n🔧 Troubleshooting:")
-        print("1. Make sure Pulsar is running: pulsar standalone")
-        print("2. Make sure you've sent messages: python ../producer/pulsar_producer.py")
-        print("3. Check if the topic exists with: curl http://localhost:8080/admin/v2/persistent/public/default")
-        print("4. Verify configuration in ../config.py")
+        info(f"\n❌ Error: {e}")
+        info("\n🔧 Troubleshooting:")
+        info("1. Make sure Pulsar is running: pulsar standalone")
+        info("2. Make sure you've sent messages: python ../producer/pulsar_producer.py")
+        info("3. Check if the topic exists with: curl http://localhost:8080/admin/v2/persistent/public/default")
+        info("4. Verify configuration in ../config.py")
         
     finally:
+        if receiver:
+            # Closing the consumer below ends a receive still in flight
+            receiver.shutdown(wait=False, cancel_futures=True)
         if consumer:
             consumer.close()
         if client:
             client.close()
-        print("🔌 Disconnected from Pulsar")
+        info("🔌 Disconnected from Pulsar")
 
 if __name__ == "__main__":
-    consume_messages() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="View financial messages from Pulsar")
+    parser.add_argument('--verbose', action='store_true',
+                        help="pretty-print the full content of every message (terminal output only)")
+    args = parser.parse_args()
+    consume_messages(verbose=args.verbose) 
\ No newline at end of file
@@ -13,8 +13,11 @@ import sys
 import logging
 from pathlib import Path
 
-# Add parent directory to path to import shared config
-sys.path.append('..')
+# Add the project root (parent of this script's directory) to the path to import
+# shared config, so imports work from any working directory
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
 from config import PROD_CONFIG, PRODUCER_CONFIG
 
 from pulsar_financial_message_producer import PulsarFinancialMessageProducer